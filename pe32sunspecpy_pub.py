@@ -44,76 +44,254 @@ http://172.16.0.1/#/commissioning/communication/modbus-tcp
 
 (See the QR-code on your SolarEdge inverter to read the password to
 connect to the network without the app.)
+
+Running with ``python -O`` is fine: protocol validation raises
+ValueError and does not rely on asserts.
 """
+import array
 import asyncio
 import os
+import socket
 import struct
 import sys
 import time
-from collections import OrderedDict
+from collections import namedtuple
 from decimal import Decimal
 from enum import Enum
 
-from asyncio_mqtt import Client as MqttClient
-
 __version__ = 'pe32sunspecpy_pub-FIXME'
 
 
-class DecimalWithUnit(Decimal):
-    @classmethod
-    def with_unit(cls, value, unit):
-        ret = cls(value)
-        ret.unit = unit
-        return ret
+class ValueWithUnit:
+    """
+    A numeric value (Decimal or int) paired with its unit, "50.007 Hz"
+
+    Not a Decimal subclass: that forced a __dict__ onto every instance
+    (Decimal is a C type without one) and arithmetic returned plain
+    Decimals anyway, requiring a re-wrap. This keeps the value as-is
+    and delegates the numeric conversions.
+    """
+    __slots__ = ('value', 'unit')
+
+    def __init__(self, value, unit):
+        self.value = value
+        self.unit = unit
+
+    def __int__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
 
     def __str__(self, format_spec=''):
-        return '{} {}'.format(super().__str__(), self.unit)
+        return '{} {}'.format(self.value, self.unit)
     __format__ = __str__
 
 
+# Trailing padding in SunSpec string registers: NULs and blanks.
+_STR_TRIM = b'\x00\x20'
+
+# Precompiled Structs for the scalar register types; unpack_from takes
+# the register buffer directly, no slice needed.
+_U16 = struct.Struct('>H')
+_I16 = struct.Struct('>h')
+_U32 = struct.Struct('>I')
+_I32 = struct.Struct('>i')
+
+
 class RType:
     """
-    Various register data conversions, operating on a callable that
-    takes an offset and an octet count.
+    Various register data conversions, operating on a register buffer
+    (bytes or memoryview) and a 16-bit register offset.
     """
     class CAST:
         "Cast U16 to the specified type"
         def __init__(self, type_):
             self._type = type_
 
-        def __call__(self, getter, offset=0):
-            return self._type(struct.unpack('>H', getter(offset, 2))[0])
+        def __call__(self, buf, offset=0):
+            return self._type(_U16.unpack_from(buf, offset * 2)[0])
 
     class BSTR:
         "Binary string (trailing spaces and NULs)"
         def __init__(self, len):
             self.len = len
 
-        def __call__(self, getter, offset=0):
-            return getter(offset, self.len)
+        def __call__(self, buf, offset=0):
+            # bytes(), as the slice may be a memoryview.
+            start = offset * 2
+            return bytes(buf[start:(start + self.len)])
 
     class STR(BSTR):
         "String (stripped of trailing blanks)"
-        def __call__(self, getter, offset=0):
+        def __call__(self, buf, offset=0):
+            # The registers hold ASCII per the SunSpec spec; the ascii
+            # codec is also faster than utf-8 for this.
             return (
-                super().__call__(getter, offset).rstrip(b'\x00\x20')
-                .decode('utf-8'))
+                super().__call__(buf, offset).rstrip(_STR_TRIM)
+                .decode('ascii'))
 
     @staticmethod
-    def I16(getter, offset=0):
-        return struct.unpack('>h', getter(offset, 2))[0]
+    def I16(buf, offset=0):
+        return _I16.unpack_from(buf, offset * 2)[0]
 
     @staticmethod
-    def U16(getter, offset=0):
-        return struct.unpack('>H', getter(offset, 2))[0]
+    def U16(buf, offset=0):
+        return _U16.unpack_from(buf, offset * 2)[0]
 
     @staticmethod
-    def I32(getter, offset=0):
-        return struct.unpack('>i', getter(offset, 4))[0]
+    def I32(buf, offset=0):
+        return _I32.unpack_from(buf, offset * 2)[0]
 
     @staticmethod
-    def U32(getter, offset=0):
-        return struct.unpack('>I', getter(offset, 4))[0]
+    def U32(buf, offset=0):
+        return _U32.unpack_from(buf, offset * 2)[0]
+
+
+def _str_field_format(type_):
+    return '{}s'.format(type_.len), (
+        lambda value: value.rstrip(_STR_TRIM).decode('ascii'))
+
+
+# Dispatch table for _mapping_field_format: keyed by the RType itself
+# for the plain ones and by the RType class for the parameterized ones
+# (STR(32), CAST(SomeEnum), ...).
+_RTYPE_FORMATS = {
+    RType.U16: lambda type_: ('H', None),
+    RType.I16: lambda type_: ('h', None),
+    RType.U32: lambda type_: ('I', None),
+    RType.I32: lambda type_: ('i', None),
+    RType.CAST: lambda type_: ('H', type_._type),
+    RType.STR: _str_field_format,
+    RType.BSTR: lambda type_: ('{}s'.format(type_.len), None),
+}
+
+
+def _mapping_field_format(type_):
+    """
+    Translate an RType to a (struct format code, postprocessor) tuple
+
+    The postprocessor is None for types that struct decodes natively.
+    """
+    handler = _RTYPE_FORMATS.get(type_) or _RTYPE_FORMATS.get(type(type_))
+    if handler is None:
+        raise NotImplementedError(type_)
+    return handler(type_)
+
+
+def _compile_mapping(mapping):
+    """
+    Compile a register mapping into a single Struct and field list
+
+    Instead of unpacking every field with a separate struct.unpack call
+    (a fresh format string and bytes slice each time), we concatenate
+    all field formats into one big-endian Struct, padding holes between
+    offsets with 'x' bytes, and unpack the whole register blob at once.
+
+    Returns (struct_, first_offset, fields) where fields is a tuple of
+    (name, postprocessor, unit, value_index) in mapping order.
+    """
+    assert mapping and len(mapping[-1]) == 1, 'expected END marker'
+    rows = []
+    for idx, item in enumerate(mapping[0:-1]):  # don't fetch END marker
+        offset, name, type_, args = item[0], item[1], item[2], item[3:]
+        assert len(args) <= 1, item
+        code, post = _mapping_field_format(type_)
+        assert not (args and post), item  # units only on numeric fields
+        rows.append((offset, idx, name, code, post, args[0] if args else None))
+
+    # A single format string needs ascending offsets; mappings may list
+    # fields out of order (see the inverter model).
+    rows.sort()
+    first = rows[0][0]
+    fmt, pos, indexed = ['>'], 0, []
+    emitted = {}  # (offset, code) -> index into the unpacked tuple
+    for offset, idx, name, code, post, unit in rows:
+        # Mappings may read a register more than once under different
+        # names (the 3-phase voltages share one _SF register); emit the
+        # struct field once and fan its value out to every name.
+        value_index = emitted.get((offset, code))
+        if value_index is None:
+            gap = (offset - first) * 2 - pos
+            assert gap >= 0, ('overlapping fields', mapping, name)
+            if gap:
+                fmt.append('{}x'.format(gap))
+            fmt.append(code)
+            pos = (offset - first) * 2 + struct.calcsize('>' + code)
+            value_index = len(emitted)
+            emitted[(offset, code)] = value_index
+        indexed.append((idx, name, post, unit, value_index))
+
+    indexed.sort()  # back to mapping order for the output dict
+    fields = tuple(
+        (name, post, unit, value_index)
+        for idx, name, post, unit, value_index in indexed)
+    return struct.Struct(''.join(fmt)), first, fields
+
+
+# Cached Decimal powers of ten for the scale factor range seen in the
+# SunSpec spec. Decimal((sign, digits, exponent)) constructs 10**exp
+# directly, skipping the (surprisingly expensive) Decimal __pow__.
+_TEN_POW = dict((exp, Decimal((0, (1,), exp))) for exp in range(-9, 10))
+
+
+# Everything mapping2dict needs per poll, compiled once per mapping:
+# the combined Struct, the first register offset, the decoded field
+# list, the scale factor ("X_SF" applies to "X") pairs and the ready
+# made decode function.
+_Plan = namedtuple('_Plan', 'struct first fields sf_plan decode')
+
+
+def _compile_decoder(struct_, fields):
+    """
+    Build the per-poll decode function for a compiled mapping
+
+    Everything the hot loop touches is bound to closure locals here, so
+    decoding a poll is a single call without attribute lookups or
+    dispatch. (Compiling this to a C extension would be the next rung,
+    but that is overkill for a 60 second poll interval.)
+    """
+    unpack_from = struct_.unpack_from
+
+    def decode(packed, byte_off):
+        values = unpack_from(packed, byte_off)
+        ret = {}
+        for name, post, unit, value_index in fields:
+            value = values[value_index]
+            if post is not None:
+                try:
+                    value = post(value)
+                except UnicodeDecodeError as e:
+                    raise ValueError(value) from e
+            if unit is not None:
+                value = ValueWithUnit(value, unit)
+            ret[name] = value
+        return ret
+
+    return decode
+
+
+# Compiled (mapping, _Plan) tuples, keyed by id(mapping). The mapping
+# itself is kept in the entry: mapping2dict accepts ad-hoc mapping
+# lists, and without the reference such a list could be garbage
+# collected, its id() reused and a stale plan served.
+_PLAN_CACHE = {}
+
+
+def _get_mapping_plan(mapping):
+    try:
+        return _PLAN_CACHE[id(mapping)][1]
+    except KeyError:
+        struct_, first, fields = _compile_mapping(mapping)
+        names = [name for name, post, unit, value_index in fields]
+        sf_plan = tuple(
+            (name[0:-3], name) for name in names if name.endswith('_SF'))
+        for key, sf_key in sf_plan:
+            assert key in names, (key, names)
+        return _PLAN_CACHE.setdefault(
+            id(mapping), (mapping, _Plan(
+                struct_, first, fields, sf_plan,
+                _compile_decoder(struct_, fields))))[1]
 
 
 class SunspecInverterStatus(Enum):
@@ -200,6 +378,11 @@ SUNSPEC_INVERTER_MODEL_ONLY_AC_POWER = (
 )
 
 
+# Cached '>HHH...' Structs for Registers._get_u16_list, keyed by
+# register count.
+_U16_LIST_STRUCTS = {}
+
+
 class Registers:
     """
     One or more register values, initialized with binary data
@@ -217,16 +400,33 @@ class Registers:
         struct.unpack('>I', registers.packed(1, 4))
     """
     def __init__(self, register_octets):
-        self._packed = register_octets
+        self._packed = bytes(register_octets)
+        # Slicing the memoryview is zero-copy, and struct.unpack
+        # accepts the slices as-is.
+        self._mv = memoryview(self._packed)
+        self._shorts = None
 
     def packed(self, offset, octets):
         start, stop = offset * 2, offset * 2 + octets
-        return self._packed[start:stop]
+        return self._mv[start:stop]
+
+    def as_shorts(self):
+        """
+        The registers as a host-endian array.array of unsigned shorts
+
+        Built lazily and kept; array.array's byteswap() converts the
+        whole block in a single C call.
+        """
+        if self._shorts is None:
+            shorts = array.array('H', self._packed)
+            if sys.byteorder == 'little':
+                shorts.byteswap()
+            self._shorts = shorts
+        return self._shorts
 
     def __getitem__(self, slice_):
         if isinstance(slice_, int):
-            start, stop = slice_, slice_ + 1
-            return self._get_u16_list(start, stop)[0]
+            return self.as_shorts()[slice_]
 
         if slice_.step is not None:
             raise NotImplementedError
@@ -244,9 +444,15 @@ class Registers:
 
     def _get_u16_list(self, start, stop):
         len_ = stop - start
-        values = struct.unpack(
-            '>{}'.format('H' * len_), self._packed[(start * 2):(stop * 2)])
-        return values
+        if start == 0 and (stop * 2) == len(self._packed):
+            # Full read: serve from the cached host-endian array.
+            return tuple(self.as_shorts())
+
+        struct_ = _U16_LIST_STRUCTS.get(len_)
+        if struct_ is None:
+            struct_ = _U16_LIST_STRUCTS.setdefault(
+                len_, struct.Struct('>{}'.format('H' * len_)))
+        return struct_.unpack_from(self._packed, start * 2)
 
 
 class RegisterIface:
@@ -269,20 +475,21 @@ class RegisterIface:
         """
         Get datatype type_ from registers at absolute offset
 
-        type_ must be a callable that takes a callable and an offset.
+        type_ must be a callable that takes a register buffer and an
+        offset.
 
         See: RType class.
         """
         try:
-            return type_(self._registers.packed, offset - self._off)
+            return type_(self._registers._mv, offset - self._off)
         except UnicodeDecodeError as e:
             raise ValueError(
-                self._registers.packed(offset - self._off, type_.len)
+                bytes(self._registers.packed(offset - self._off, type_.len))
                 ) from e
 
     def mapping2dict(self, mapping):
         """
-        Take a list of (offset, name, type) tuples, return an OrderedDict
+        Take a list of (offset, name, type) tuples, return a dict
 
         Example usage::
 
@@ -297,20 +504,9 @@ class RegisterIface:
             # ^- returns a dict with key 'C_SunSpec_ID' and the unsigned
             #    int32 taken from offset 40000.
         """
-        ret = OrderedDict()
-        assert mapping and len(mapping[-1]) == 1, 'expected END marker'
-        for item in mapping[0:-1]:  # don't fetch END marker
-            offset, name, type_, args = item[0], item[1], item[2], item[3:]
-            value = self.get(offset, type_)
-
-            if args:
-                assert len(args) == 1, item
-                assert isinstance(value, (Decimal, int)), (type(value), value)
-                value = DecimalWithUnit.with_unit(value, args[0])
-
-            ret[name] = value
-
-        return ret
+        plan = _get_mapping_plan(mapping)
+        return plan.decode(
+            self._registers._packed, (plan.first - self._off) * 2)
 
 
 class SunspecRegs(RegisterIface):
@@ -329,21 +525,29 @@ class SunspecRegs(RegisterIface):
             {'I_AC_Frequency': Decimal('50.015'), ...}
         """
         ret = super().mapping2dict(mapping)
-        sf_keys = [key for key in ret.keys() if key.endswith('_SF')]
-        for sf_key in sf_keys:
-            key = sf_key[0:-3]
-            assert key in ret, (key, ret)
-            exp = Decimal(10) ** ret[sf_key]  # *10^x (E-1, E01, ...)
-            if isinstance(ret[key], DecimalWithUnit):
-                value = DecimalWithUnit.with_unit(
-                    ret[key] * exp, ret[key].unit)
+        for key, sf_key in _get_mapping_plan(mapping).sf_plan:
+            exp = ret.pop(sf_key)  # *10^x (E-1, E01, ...)
+            value = ret[key]
+            if exp >= 0:
+                # Integer-preserving fast path; no Decimal arithmetic.
+                scaled = int(value) * 10 ** exp
             else:
-                value = Decimal(ret[key]) * exp
-            ret[key] = value
-            del ret[sf_key]
+                ten_pow = _TEN_POW.get(exp) or Decimal((0, (1,), int(exp)))
+                scaled = Decimal(int(value)) * ten_pow
+            if isinstance(value, ValueWithUnit):
+                scaled = ValueWithUnit(scaled, value.unit)
+            ret[key] = scaled
         return ret
 
 
+# MBAP header: transaction id, protocol id, data length, unit id,
+# function code.
+_MBAP_HDR = struct.Struct('>HHHBB')
+
+# Read Multiple Holding Registers request data: offset, count.
+_REQ_RMR = struct.Struct('>HH')
+
+
 class ModbusFrame:
     """
     Modbus request/response packet
@@ -361,19 +565,22 @@ class ModbusFrame:
     @classmethod
     def read_multiple_registers(cls, transid, unitid, offset, count):
         return ModbusFrame(
-            transid, unitid, 0x3, bytes([
-                offset >> 8, offset & 0xff, count >> 8, count & 0xff]))
+            transid, unitid, 0x3, _REQ_RMR.pack(offset, count))
 
     @classmethod
     def unpack(cls, bytes_):
-        assert len(bytes_) >= 8, bytes_
-        transid = (bytes_[0] << 8 | bytes_[0])
-        assert bytes_[2] == bytes_[3] == 0, bytes_
-        datalen = (bytes_[4] << 8 | bytes_[5])
-        assert datalen >= 2, bytes_
-        assert len(bytes_) >= (datalen + 6), bytes_
-        unitid = bytes_[6]
-        funccode = bytes_[7]
+        # Explicit raises, not asserts: this validates data from the
+        # wire and must survive python -O.
+        if len(bytes_) < 8:
+            raise ValueError(('short frame', bytes_))
+        transid, protoid, datalen, unitid, funccode = (
+            _MBAP_HDR.unpack_from(bytes_, 0))
+        if protoid != 0:
+            raise ValueError(('unexpected protocol id', bytes_))
+        if datalen < 2:
+            raise ValueError(('bad data length', bytes_))
+        if len(bytes_) < (datalen + 6):
+            raise ValueError(('truncated frame', bytes_))
         data = bytes_[8:]
         return ModbusFrame(transid, unitid, funccode, data)
 
@@ -394,10 +601,11 @@ class ModbusFrame:
         Feels a bit superfluous perhaps, as we may treat these as other
         data types later on, but let's stick to the protocol.
         """
-        assert self.data, self.data
-        assert (self.data[0] % 2) == 0, self.data
+        if not self.data or (self.data[0] % 2) != 0:
+            raise ValueError(('bad register data', self.data))
         hlen = self.data[0] >> 1
-        assert len(self.data) >= (hlen + 1), self.data
+        if len(self.data) < (1 + hlen * 2):
+            raise ValueError(('truncated register data', self.data))
         # manual = tuple((h << 8 | l) for h, l in zip(
         #     self.data[1::2], self.data[2::2]))
         # faster = struct.unpack('>{}'.format('H' * hlen), self.data[1:])
@@ -408,43 +616,110 @@ class ModbusFrame:
     def pack(self):
         # https://en.wikipedia.org/wiki/Modbus#
         #   Modbus_TCP_frame_format_(primarily_used_on_Ethernet_networks)
-        datalen = (1 + 1 + len(self.data))  # unit+funccode+data
-        return bytes([
-            self.transid >> 8,      # 0: transaction id - copied by server
-            self.transid & 0xff,    # 1: transaction id - copied by server
-            0,                      # 2: protocol id - 0
-            0,                      # 3: protocol id - 0
-            datalen >> 8,           # 4: data length
-            datalen & 0xff,         # 5: data length
-            self.unitid,            # 6: unit identifier ('slave address')
-            self.funccode,          # 7: MODBUS function code
-        ]) + self.data
+        # Transaction id (copied by server), protocol id (0), data
+        # length (unit+funccode+data), unit identifier ('slave
+        # address'), MODBUS function code.
+        datalen = (1 + 1 + len(self.data))
+        return _MBAP_HDR.pack(
+            self.transid, 0, datalen, self.unitid, self.funccode) + self.data
 
 
 class SunspecModbusTcpAsyncio:
     def __init__(self, reader, writer):
         self.reader, self.writer = reader, writer
         self.transid = 0
+        # One request/response pair on the wire at a time; keeps
+        # concurrent get_from_mapping() callers from interleaving
+        # frames.
+        self._lock = asyncio.Lock()
+        # Reusable request buffer: MBAP header (8) plus offset and
+        # count (4). The transport may buffer it zero-copy, but
+        # refilling is safe: the lock makes us await the full response
+        # -- so the request has left the transport -- before the
+        # buffer is packed again.
+        self._req_buf = bytearray(12)
+
+    async def _read_frame(self):
+        """
+        Read exactly one MBAP-framed Modbus response
+
+        The MBAP header is 6 octets: transaction id, protocol id and
+        data length. The data length tells us exactly how much follows
+        (unit id, function code, data), so we never over-read and a
+        response split across TCP segments is reassembled correctly.
+        """
+        header = await self.reader.readexactly(6)
+        transid = (header[0] << 8 | header[1])
+        if header[2] != 0 or header[3] != 0:
+            raise ValueError(('unexpected protocol id', header))
+        datalen = (header[4] << 8 | header[5])
+        if datalen < 2:
+            raise ValueError(('bad data length', header))
+        body = await self.reader.readexactly(datalen)
+        return ModbusFrame(transid, body[0], body[1], body[2:])
+
+    async def _read_registers(self, first_reg, count, unit):
+        async with self._lock:
+            self.transid = (self.transid + 1) & 0xffff
+            # Fill the preallocated buffer in place; same octets as
+            # ModbusFrame.read_multiple_registers(...).pack() without
+            # the intermediate objects.
+            _MBAP_HDR.pack_into(
+                self._req_buf, 0, self.transid, 0, 6, unit, 0x3)
+            _REQ_RMR.pack_into(self._req_buf, 8, first_reg, count)
+            self.writer.write(self._req_buf)
+
+            response = await self._read_frame()
+
+        if response.transid != self.transid:
+            raise ValueError(
+                ('transaction id mismatch', response.transid, self.transid))
+        return response.data_as_registers()
 
     async def get_from_mapping(self, mapping, unit=1):
         first_reg = mapping[0][0]
         eof_reg = mapping[-1][0]
-        count = eof_reg - first_reg
 
-        self.transid += 1
-        request = ModbusFrame.read_multiple_registers(
-            self.transid, unit, first_reg, count)
-        self.writer.write(request.pack())
+        registers = await self._read_registers(
+            first_reg, eof_reg - first_reg, unit)
+        sunspecregs = SunspecRegs(first_reg, registers)
+        return sunspecregs.mapping2dict(mapping)
 
-        bytes_ = await self.reader.read(4096)
-        response = ModbusFrame.unpack(bytes_)
-        registers = response.data_as_registers()
+    async def get_from_mappings(self, mappings, unit=1):
+        """
+        Fetch multiple (adjacent) mappings with one combined Modbus read
 
+        A single read spanning from the lowest to the highest offset is
+        issued and every mapping is decoded from the one register blob:
+        half the round trips of fetching the mappings one by one.
+
+        Returns a list of dicts, one per mapping.
+        """
+        first_reg = min(mapping[0][0] for mapping in mappings)
+        eof_reg = max(mapping[-1][0] for mapping in mappings)
+
+        registers = await self._read_registers(
+            first_reg, eof_reg - first_reg, unit)
         sunspecregs = SunspecRegs(first_reg, registers)
-        return sunspecregs.mapping2dict(mapping)
+        return [sunspecregs.mapping2dict(mapping) for mapping in mappings]
 
 
 class Pe32SunspecPublisher:
+    # Dynamic payload fields as (prefix, source key, coercion),
+    # appended between the once-encoded head and tail in publish().
+    _PAYLOAD_PLAN = (
+        (b'&s_act_energy_wh=', 'I_AC_Energy_WH', int),
+        (b'&s_inst_power_w=', 'I_AC_Power', int),
+        (b'&s_temperature=', 'I_Temp_Sink', float),
+        (b'&s_status=', 'I_Status', str),
+        (b':', 'I_Status_Vendor', str),
+        (b'&p_freq=', 'I_AC_Frequency', float),
+        (b'&p_volt=', 'I_AC_VoltageAB', float),
+        (b'&dbg_s_current=', 'I_AC_Current', float),
+        (b'&dbg_s_va=', 'I_AC_VA', float),
+        (b'&dbg_s_var=', 'I_AC_VAR', float),
+    )
+
     def __init__(self):
         self._mqtt_broker = os.environ.get(
             'PE32SUNSPEC_BROKER', 'test.mosquitto.org')
@@ -453,8 +728,17 @@ class Pe32SunspecPublisher:
         self._mqttc = None
         self._guid = os.environ.get(
             'PE32SUNSPEC_GUID', 'EUI48:11:22:33:44:55:66')
+        # The constant payload pieces never change; encode them once.
+        self._payload_head = 'device_id={}&s_identifier='.format(
+            self._guid).encode('ascii')
+        self._payload_tail = '&dbg_version={}'.format(
+            __version__).encode('ascii')
 
     def open(self):
+        # Import here: the MQTT stack is only needed in --publish mode,
+        # so plain one-shot reads don't pay for (or even need) it.
+        from asyncio_mqtt import Client as MqttClient
+
         # Unfortunately this does use a thread for keepalives. Oh well.
         # As long as it's implemented correctly, I guess we can live
         # with it.
@@ -464,62 +748,91 @@ class Pe32SunspecPublisher:
     async def publish(self, kv):
         # print(f'publish: {kv}')
 
-        tm = int(time.time())
         s_identifier = (
             f'{kv["C_Manufacturer"]}/{kv["C_Model"]}/{kv["C_Version"]}/'
             f'{kv["C_SerialNumber"]}')
 
-        mqtt_string = (
-            f'device_id={self._guid}&'
-            f's_identifier={s_identifier}&'
-            f's_act_energy_wh={int(kv["I_AC_Energy_WH"])}&'
-            f's_inst_power_w={int(kv["I_AC_Power"])}&'
-            f's_temperature={float(kv["I_Temp_Sink"])}&'
-            f's_status={kv["I_Status"]}:{kv["I_Status_Vendor"]}&'
-            f'p_freq={float(kv["I_AC_Frequency"])}&'
-            f'p_volt={float(kv["I_AC_VoltageAB"])}&'
-            f'dbg_s_current={float(kv["I_AC_Current"])}&'
-            f'dbg_s_va={float(kv["I_AC_VA"])}&'
-            f'dbg_s_var={float(kv["I_AC_VAR"])}&'
-            f'dbg_uptime={tm}&'
-            f'dbg_version={__version__}').encode('ascii')
+        payload = bytearray(self._payload_head)
+        payload += s_identifier.encode('ascii')
+        for prefix, key, coerce in self._PAYLOAD_PLAN:
+            payload += prefix
+            payload += str(coerce(kv[key])).encode('ascii')
+        payload += b'&dbg_uptime=%d' % int(time.time())
+        payload += self._payload_tail
+        mqtt_string = bytes(payload)
 
         await self._mqttc.publish(self._mqtt_topic, payload=mqtt_string)
 
         print(f'Published: {mqtt_string}')
 
 
-async def oneshot(host, port):
+async def connect(host, port):
     reader, writer = await asyncio.open_connection(host, port)
-    c = SunspecModbusTcpAsyncio(reader, writer)
+    sock = writer.get_extra_info('socket')
+    if sock is not None:
+        # The requests are a mere 12 octets; don't let Nagle hold them
+        # back for a round trip.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return SunspecModbusTcpAsyncio(reader, writer)
+
+
+async def get_values(conn):
+    d, d2 = await conn.get_from_mappings((
+        SUNSPEC_COMMON_MODEL_REGISTER_MAPPINGS,
+        SUNSPEC_INVERTER_MODEL_REGISTER_MAPPINGS))
 
-    d = await c.get_from_mapping(SUNSPEC_COMMON_MODEL_REGISTER_MAPPINGS)
-    assert d['C_SunSpec_ID'] == 0x53756e53, ('C_SunSpec_ID != "SunS"', d)
+    if d['C_SunSpec_ID'] != 0x53756e53:
+        raise ValueError(('C_SunSpec_ID != "SunS"', d))
     d.pop('C_SunSpec_DID', None)
     d.pop('C_SunSpec_Length', None)
 
-    d2 = await c.get_from_mapping(SUNSPEC_INVERTER_MODEL_REGISTER_MAPPINGS)
     d2.pop('C_SunSpec_DID', None)
     d2.pop('C_SunSpec_Length', None)
 
-    writer.close()  # synchronous
-
     d.update(d2)
     return d
 
 
+async def oneshot(host, port):
+    conn = await connect(host, port)
+    try:
+        return await get_values(conn)
+    finally:
+        conn.writer.close()  # synchronous
+
+
 async def mainloop(host, port):
     publisher = Pe32SunspecPublisher()
+    conn = None
+    next_tick = time.monotonic()
     async with publisher.open():
         while True:
             try:
-                data = await asyncio.wait_for(
-                    oneshot(host, port), timeout=5)
+                if conn is None:
+                    conn = await asyncio.wait_for(
+                        connect(host, port), timeout=5)
+                data = await asyncio.wait_for(get_values(conn), timeout=5)
                 await asyncio.wait_for(publisher.publish(data), timeout=5)
-            except asyncio.TimeoutError:
-                print('timeout, alas..')
+            except (ConnectionError, EOFError, asyncio.TimeoutError):
+                print('timeout/connection lost, alas..')
+                if conn is not None:
+                    # After a timeout the stream may hold half a frame;
+                    # reconnect rather than resynchronize.
+                    conn.writer.close()  # synchronous
+                    conn = None
+                # A refused connect fails instantly: without a delay we
+                # would busy-loop (and flood the journal) for the whole
+                # outage. Back off like the systemd RestartSec=15 did
+                # when we still crashed on connection errors.
+                await asyncio.sleep(15)
             else:
-                await asyncio.sleep(60)
+                # Sleep until the next 60s grid point instead of
+                # sleeping 60s: a plain sleep adds the poll's own
+                # latency to the period and the readings drift.
+                now = time.monotonic()
+                while next_tick <= now:  # skip ticks missed by overruns
+                    next_tick += 60.0
+                await asyncio.sleep(next_tick - now)
 
 
 def main():